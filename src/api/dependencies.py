@@ -0,0 +1,10 @@
+"""Shared FastAPI dependencies"""
+
+from fastapi import Request
+
+from src.services.capcorn_client import CapCornClient
+
+
+def get_capcorn_client(request: Request) -> CapCornClient:
+    """Get the shared CapCorn client created in the application lifespan"""
+    return request.app.state.capcorn_client
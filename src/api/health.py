@@ -0,0 +1,30 @@
+"""Health check endpoints"""
+
+from fastapi import APIRouter
+
+from src.core.config import get_settings
+
+settings = get_settings()
+
+# Probes hit these frequently, so they are kept out of the OpenAPI schema
+# and excluded from request tracing in src/main.py
+router = APIRouter(tags=["health"], include_in_schema=False)
+
+# Trace exclusion patterns, matched against the full request URL
+EXCLUDED_TRACE_URLS = [r"://[^/]+/$", r"/health$"]
+
+
+@router.get("/")
+async def root():
+    """Root endpoint - health check"""
+    return {
+        "status": "healthy",
+        "app": settings.app_name,
+        "version": settings.app_version,
+    }
+
+
+@router.get("/health")
+async def health_check():
+    """Health check endpoint"""
+    return {"status": "ok"}
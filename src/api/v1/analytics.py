@@ -6,6 +6,7 @@ from typing import Annotated
 from src.services.analytics_service import get_analytics_service
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
+_analytics = get_analytics_service()
 
 
 @router.get("/summary")
@@ -28,8 +29,7 @@ async def get_analytics_summary(
     - Popular durations
     - Detailed search and reservation logs
     """
-    analytics = get_analytics_service()
-    return await analytics.get_analytics_summary(hours)
+    return await _analytics.get_analytics_summary(hours)
 
 
 # @router.get("/searches")
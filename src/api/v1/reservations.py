@@ -1,17 +1,23 @@
 """Reservation/booking endpoints"""
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Annotated
 import logfire
 
+from src.api.dependencies import get_capcorn_client
 from src.schemas.reservation import ReservationRequest, ReservationResponse
 from src.services.capcorn_client import CapCornClient
 from src.services.analytics_service import get_analytics_service
 
 router = APIRouter(prefix="/reservations", tags=["reservations"])
+_analytics = get_analytics_service()
 
 
 @router.post("", response_model=ReservationResponse, status_code=status.HTTP_201_CREATED)
-async def create_reservation(request: ReservationRequest):
+async def create_reservation(
+    request: ReservationRequest,
+    client: Annotated[CapCornClient, Depends(get_capcorn_client)],
+):
     """
     Create a new hotel reservation.
     
@@ -29,11 +35,9 @@ async def create_reservation(request: ReservationRequest):
     """
     try:
         # Log analytics
-        analytics = get_analytics_service()
-        await analytics.log_reservation(request.model_dump(mode="json"))
+        _analytics.enqueue_reservation(request)
         
-        client = CapCornClient()
-        logfire.info(f"Creating reservation with request: {request.model_dump()}")
+        logfire.info("Creating reservation", request=request)
         response = await client.create_reservation(request)
         
         if not response.success:
@@ -42,7 +46,7 @@ async def create_reservation(request: ReservationRequest):
                 detail=response.message,
             )
         
-        logfire.info(f"Reservation created successfully: {response}")
+        logfire.info("Reservation created successfully", response=response)
         return response
     except HTTPException:
         raise
@@ -1,9 +1,13 @@
 """Room availability endpoints"""
 
 import asyncio
-from fastapi import APIRouter, HTTPException, status
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import BaseModel
+from typing import Annotated
 import logfire
 
+from src.api.dependencies import get_capcorn_client
 from src.schemas.room_availability import (
     RoomAvailabilityRequest,
     RoomAvailabilityResponse,
@@ -14,17 +18,28 @@ from src.schemas.simplified_search import (
     SimplifiedRoomSearchRequest,
     SimplifiedRoomSearchResponse,
     RoomOptionWithDateRange,
-    Language,
 )
 from src.services.capcorn_client import CapCornClient
 from src.services.analytics_service import get_analytics_service
 from src.core.config import get_settings
 
 router = APIRouter(prefix="/rooms", tags=["rooms"])
+_analytics = get_analytics_service()
+
+# Upstream errors that would fail every date range of a search the same way
+_FAIL_FAST_STATUS_CODES = frozenset({400, 401, 403, 404})
+
+
+def _json_response(model: BaseModel) -> Response:
+    """Serialize a response model straight to JSON bytes with pydantic-core"""
+    return Response(content=model.model_dump_json(), media_type="application/json")
 
 
 @router.post("/search", response_model=SimplifiedRoomSearchResponse)
-async def search_rooms(request: SimplifiedRoomSearchRequest):
+async def search_rooms(
+    request: SimplifiedRoomSearchRequest,
+    client: Annotated[CapCornClient, Depends(get_capcorn_client)],
+):
     """
     Search for available rooms with flexible duration within a timespan.
     
@@ -40,11 +55,10 @@ async def search_rooms(request: SimplifiedRoomSearchRequest):
     Example: If timespan is 7 days and duration is 4 days, 
     4 parallel queries will be made covering all possible 4-day stays.
     """
-    logfire.info(f"Simplified Room Search Request: {request.model_dump()}")
+    logfire.info("Simplified Room Search Request", request=request)
     
     try:
         settings = get_settings()
-        client = CapCornClient()
         
         # Generate all date ranges
         date_ranges = request.generate_date_ranges()
@@ -56,74 +70,90 @@ async def search_rooms(request: SimplifiedRoomSearchRequest):
             )
         
         # Convert language to API format (0=German, 1=English)
-        language_code = 0 if request.language == Language.GERMAN else 1
+        language_code = 0 if request.language == "de" else 1
+        
+        # Fields shared by every date range. Values come from the validated
+        # search request, so the per-range requests skip re-validation
+        children = [ChildRequest.model_construct(age=child.age) for child in request.children]
+        request_template = {
+            "language": language_code,
+            "hotel_id": settings.capcorn_hotel_id,
+            "rooms": [RoomRequest.model_construct(adults=request.adults, children=children)],
+        }
         
-        # Prepare children data
-        children = [ChildRequest(age=child.age) for child in request.children]
+        # Limit in-flight CapCorn requests to avoid upstream throttling
+        semaphore = asyncio.Semaphore(settings.capcorn_max_concurrency)
+        results: list[RoomAvailabilityResponse | Exception | None] = [None] * len(date_ranges)
         
-        # Create parallel requests for all date ranges
-        async def search_single_range(arrival_date, departure_date):
-            search_request = RoomAvailabilityRequest(
-                language=language_code,
-                hotel_id=settings.capcorn_hotel_id,
+        async def search_single_range(idx, arrival_date, departure_date):
+            search_request = RoomAvailabilityRequest.model_construct(
                 arrival=arrival_date,
                 departure=departure_date,
-                rooms=[RoomRequest(adults=request.adults, children=children)],
+                **request_template,
             )
-            return await client.search_room_availability(search_request)
+            async with semaphore:
+                try:
+                    results[idx] = await client.search_room_availability(search_request)
+                except httpx.HTTPStatusError as e:
+                    # Non-retryable client errors are not specific to a date range,
+                    # so fail fast and let the task group cancel the remaining
+                    # searches. Throttling (429) and timeouts (408) only lose this range
+                    if e.response.status_code in _FAIL_FAST_STATUS_CODES:
+                        raise
+                    results[idx] = e
+                except Exception as e:
+                    results[idx] = e
+            
+            if isinstance(results[idx], Exception):
+                logfire.warning(
+                    "Room search for {arrival} - {departure} failed: {error}",
+                    arrival=arrival_date,
+                    departure=departure_date,
+                    error=str(results[idx]),
+                )
         
-        # Execute all searches in parallel
-        search_tasks = [
-            search_single_range(arrival, departure)
-            for arrival, departure in date_ranges
-        ]
-        results = await asyncio.gather(*search_tasks, return_exceptions=True)
+        # Execute all searches concurrently
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for idx, (arrival, departure) in enumerate(date_ranges):
+                    task_group.create_task(search_single_range(idx, arrival, departure))
+        except* httpx.HTTPStatusError as eg:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Failed to search room availability: {eg.exceptions[0].response.status_code}",
+            ) from None
         
-        # Collect all room options from all results
-        all_options = []
-        for idx, result in enumerate(results):
-            if isinstance(result, Exception):
-                # Log error but continue with other results
-                continue
-            
-            arrival, departure = date_ranges[idx]
-            
-            # Extract room options from response
-            for member in result.members:
-                for room in member.rooms:
-                    for option in room.options:
-                        all_options.append(
-                            RoomOptionWithDateRange(
-                                arrival=arrival,
-                                departure=departure,
-                                catc=option.catc,
-                                type=option.type,
-                                description=option.description,
-                                size=option.size,
-                                price=option.price,
-                                price_per_person=option.price_per_person,
-                                price_per_adult=option.price_per_adult,
-                                price_per_night=option.price_per_night,
-                                board=option.board,
-                                room_type=option.room_type,
-                            )
-                        )
+        # Collect all room options from all results, skipping failed ranges
+        # (already logged above). The options were validated as RoomOption,
+        # so the copied fields are not re-validated
+        construct_option = RoomOptionWithDateRange.model_construct
+        all_options = [
+            construct_option(arrival=arrival, departure=departure, **option.__dict__)
+            for (arrival, departure), result in zip(date_ranges, results)
+            if not isinstance(result, Exception)
+            for member in result.members
+            for room in member.rooms
+            for option in room.options
+        ]
         
-        logfire.info(f"Simplified Room Search found {len(all_options)} options across {len(date_ranges)} queries.")
-        logfire.info(f"Room Search Response: {all_options}")
+        # Log a bounded sample of the options; the full list can hold thousands of entries
+        logfire.info(
+            "Simplified Room Search found {options_count} options across {queries_count} queries",
+            options_count=len(all_options),
+            queries_count=len(date_ranges),
+            first_options=all_options[:5],
+        )
         
         # Log analytics with results count
-        analytics = get_analytics_service()
-        await analytics.log_room_search(
-            request.model_dump(mode="json"),
-            results_count=len(all_options)
-        )
+        _analytics.enqueue_room_search(request, results_count=len(all_options))
         
-        return SimplifiedRoomSearchResponse(
-            total_queries=len(date_ranges),
-            total_options=len(all_options),
-            duration_days=request.duration,
-            options=all_options,
+        return _json_response(
+            SimplifiedRoomSearchResponse(
+                total_queries=len(date_ranges),
+                total_options=len(all_options),
+                duration_days=request.duration,
+                options=all_options,
+            )
         )
         
     except HTTPException:
@@ -136,7 +166,10 @@ async def search_rooms(request: SimplifiedRoomSearchRequest):
 
 
 @router.post("/availability", response_model=RoomAvailabilityResponse)
-async def search_room_availability(request: RoomAvailabilityRequest):
+async def search_room_availability(
+    request: RoomAvailabilityRequest,
+    client: Annotated[CapCornClient, Depends(get_capcorn_client)],
+):
     """
     Direct room availability search (original API format).
     
@@ -147,8 +180,7 @@ async def search_room_availability(request: RoomAvailabilityRequest):
     - **rooms**: List of rooms with adults and children (max 10 rooms)
     """
     try:
-        client = CapCornClient()
-        return await client.search_room_availability(request)
+        return _json_response(await client.search_room_availability(request))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
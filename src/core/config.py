@@ -1,7 +1,7 @@
 """Application configuration management"""
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from functools import lru_cache
+from functools import cached_property, lru_cache
 
 
 class Settings(BaseSettings):
@@ -19,6 +19,12 @@ class Settings(BaseSettings):
     capcorn_password: str
     capcorn_hotel_id: str
     capcorn_pin: str
+    capcorn_timeout: float = 30.0
+    capcorn_max_connections: int = 100
+    capcorn_max_keepalive_connections: int = 50
+    capcorn_max_concurrency: int = 8
+    capcorn_cache_ttl: float = 60.0
+    capcorn_cache_maxsize: int = 4096
     
     # CORS
     cors_origins: str = "*"
@@ -31,9 +37,9 @@ class Settings(BaseSettings):
         case_sensitive=False
     )
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
-        """Get CORS origins as a list"""
+        """Get CORS origins as a list (parsed once per settings instance)"""
         if self.cors_origins == "*":
             return ["*"]
         return [origin.strip() for origin in self.cors_origins.split(",")]
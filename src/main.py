@@ -1,11 +1,16 @@
 """FastAPI application entry point"""
 
+from contextlib import asynccontextmanager
+
 import logfire
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.config import get_settings
+from src.api import health
 from src.api.v1.router import api_router
+from src.services.analytics_service import get_analytics_service
+from src.services.capcorn_client import CapCornClient
 
 settings = get_settings()
 
@@ -19,24 +24,40 @@ if settings.logfire_api_key:
     # Instrument httpx for external API calls logging
     logfire.instrument_httpx()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared clients on startup and release them on shutdown"""
+    # One client (and connection pool) shared by all requests
+    capcorn_client = CapCornClient()
+    app.state.capcorn_client = capcorn_client
+    
+    # Analytics events are stored by a background worker, off the request path
+    analytics = get_analytics_service()
+    analytics.start()
+    try:
+        yield
+    finally:
+        await analytics.stop()
+        await capcorn_client.close()
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="FastAPI wrapper for CapCorn Hotel API",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
-# Instrument FastAPI with Logfire (logs all requests, responses, and bodies)
-if settings.logfire_api_key:
+# Instrument FastAPI with Logfire (logs all requests, responses, and bodies).
+# Path and method are already recorded on every request span.
+if settings.logfire_api_key and not settings.debug:
     logfire.instrument_fastapi(
         app,
         capture_headers=True,
-        request_attributes_mapper=lambda request, attributes: {
-            **attributes,
-            "custom.path": request.url.path,
-            "custom.method": request.method,
-        },
+        excluded_urls=health.EXCLUDED_TRACE_URLS,
     )
 
 # CORS middleware
@@ -49,20 +70,5 @@ app.add_middleware(
 )
 
 # Include API routes
+app.include_router(health.router)
 app.include_router(api_router, prefix="/api")
-
-
-@app.get("/", tags=["health"])
-async def root():
-    """Root endpoint - health check"""
-    return {
-        "status": "healthy",
-        "app": settings.app_name,
-        "version": settings.app_version,
-    }
-
-
-@app.get("/health", tags=["health"])
-async def health_check():
-    """Health check endpoint"""
-    return {"status": "ok"}
@@ -1,18 +1,27 @@
 """Pydantic schemas for reservation/booking requests"""
 
 from datetime import date
-from pydantic import BaseModel, Field, EmailStr, field_validator
-from typing import Optional
-from enum import IntEnum
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, StringConstraints, TypeAdapter, model_validator
+from typing import Annotated, Any, Literal, Optional
 
 
-class MealPlan(IntEnum):
-    """Meal plan options"""
-    BREAKFAST = 1
-    HALF_BOARD = 2
-    FULL_BOARD = 3
-    NO_MEALS = 4
-    ALL_INCLUSIVE = 5
+_INT_ADAPTER = TypeAdapter(int)
+
+
+def _parse_numeric_string(value: Any) -> Any:
+    """Parse numeric strings like "1" as ints; Literal would reject them"""
+    return _INT_ADAPTER.validate_python(value) if isinstance(value, str) else value
+
+
+# Meal plan options: 1=Breakfast, 2=Half board, 3=Full board, 4=No meals, 5=All inclusive.
+# Numeric strings are accepted, as they were when this was an IntEnum
+MealPlan = Annotated[Literal[1, 2, 3, 4, 5], BeforeValidator(_parse_numeric_string)]
+
+# Lightweight email check, validated natively by pydantic-core
+Email = Annotated[
+    str,
+    StringConstraints(pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$", max_length=254, to_lower=True),
+]
 
 
 class GuestCount(BaseModel):
@@ -43,7 +52,7 @@ class GuestInfo(BaseModel):
     given_name: str
     surname: str
     phone_number: str
-    email: EmailStr
+    email: Email
     address: AddressInfo
 
 
@@ -51,7 +60,7 @@ class ReservationRequest(BaseModel):
     """Complete reservation/booking request"""
     room_type_code: str = Field(..., max_length=8, description="Room category code")
     number_of_units: int = Field(1, ge=1, description="Number of rooms to book")
-    meal_plan: MealPlan = Field(MealPlan.BREAKFAST, description="Included meals (default: Breakfast)")
+    meal_plan: MealPlan = Field(1, description="Included meals (default: Breakfast)")
     guest_counts: list[GuestCount] = Field(..., min_length=1)
     arrival: date
     departure: date
@@ -62,16 +71,17 @@ class ReservationRequest(BaseModel):
     reservation_id: str = Field(..., description="Unique booking ID in your system")
     source: str = Field("LookingCom", description="Source/channel name")
     
-    @field_validator("departure")
-    @classmethod
-    def validate_departure_after_arrival(cls, v, info):
-        if "arrival" in info.data and v <= info.data["arrival"]:
+    @model_validator(mode="after")
+    def validate_departure_after_arrival(self):
+        if self.departure <= self.arrival:
             raise ValueError("Departure date must be after arrival date")
-        return v
+        return self
 
 
 class ReservationResponse(BaseModel):
     """Response from reservation attempt"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     success: bool
     message: str
     reservation_id: Optional[str] = None
@@ -1,7 +1,7 @@
 """Pydantic schemas for room availability requests and responses"""
 
 from datetime import date
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 class ChildRequest(BaseModel):
@@ -13,13 +13,6 @@ class RoomRequest(BaseModel):
     """Room configuration for search"""
     adults: int = Field(..., ge=1, description="Number of adults")
     children: list[ChildRequest] = Field(default_factory=list, max_length=8)
-    
-    @field_validator("children")
-    @classmethod
-    def validate_children_count(cls, v):
-        if len(v) > 8:
-            raise ValueError("Maximum 8 children per room")
-        return v
 
 
 class RoomAvailabilityRequest(BaseModel):
@@ -30,28 +23,24 @@ class RoomAvailabilityRequest(BaseModel):
     departure: date = Field(..., description="Departure date")
     rooms: list[RoomRequest] = Field(..., min_length=1, max_length=10)
     
-    @field_validator("rooms")
-    @classmethod
-    def validate_rooms_count(cls, v):
-        if len(v) > 10:
-            raise ValueError("Maximum 10 rooms per search")
-        return v
-    
-    @field_validator("departure")
-    @classmethod
-    def validate_departure_after_arrival(cls, v, info):
-        if "arrival" in info.data and v <= info.data["arrival"]:
+    @model_validator(mode="after")
+    def validate_departure_after_arrival(self):
+        if self.departure <= self.arrival:
             raise ValueError("Departure date must be after arrival date")
-        return v
+        return self
 
 
 class ChildResponse(BaseModel):
     """Child information in response"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     age: int
 
 
 class RoomOption(BaseModel):
     """Available room option"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     catc: str = Field(..., description="Room category code")
     type: str = Field(..., description="General room name")
     description: str = Field(..., description="Detailed room description")
@@ -66,6 +55,8 @@ class RoomOption(BaseModel):
 
 class RoomResponse(BaseModel):
     """Room search result"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     arrival: date
     departure: date
     adults: int
@@ -75,10 +66,14 @@ class RoomResponse(BaseModel):
 
 class MemberResponse(BaseModel):
     """Hotel member with available rooms"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     hotel_id: str
     rooms: list[RoomResponse]
 
 
 class RoomAvailabilityResponse(BaseModel):
     """Response model for room availability search"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     members: list[MemberResponse]
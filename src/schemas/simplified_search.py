@@ -1,14 +1,12 @@
 """Simplified request schemas for room availability"""
 
-from datetime import date, timedelta
-from pydantic import BaseModel, Field, field_validator
-from enum import Enum
+from datetime import date
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import Literal
 
 
-class Language(str, Enum):
-    """Supported languages"""
-    GERMAN = "de"
-    ENGLISH = "en"
+# Supported languages
+Language = Literal["de", "en"]
 
 
 class ChildAgeRequest(BaseModel):
@@ -21,12 +19,11 @@ class TimeSpan(BaseModel):
     from_date: date = Field(..., alias="from", description="Start date of search period")
     to_date: date = Field(..., alias="to", description="End date of search period")
     
-    @field_validator("to_date")
-    @classmethod
-    def validate_to_after_from(cls, v, info):
-        if "from_date" in info.data and v <= info.data["from_date"]:
+    @model_validator(mode="after")
+    def validate_to_after_from(self):
+        if self.to_date <= self.from_date:
             raise ValueError("'to' date must be after 'from' date")
-        return v
+        return self
     
     class Config:
         populate_by_name = True
@@ -34,30 +31,20 @@ class TimeSpan(BaseModel):
 
 class SimplifiedRoomSearchRequest(BaseModel):
     """Simplified request model for room search with flexible duration"""
-    language: Language = Field(Language.GERMAN, description="Language preference")
+    language: Language = Field("de", description="Language preference")
     timespan: TimeSpan = Field(..., description="Date range to search within")
     duration: int = Field(..., ge=1, description="Length of stay in days")
     adults: int = Field(..., ge=1, description="Number of adults")
     children: list[ChildAgeRequest] = Field(default_factory=list, max_length=8)
     
-    @field_validator("children")
-    @classmethod
-    def validate_children_count(cls, v):
-        if len(v) > 8:
-            raise ValueError("Maximum 8 children per room")
-        return v
-    
-    @field_validator("duration")
-    @classmethod
-    def validate_duration_within_timespan(cls, v, info):
-        if "timespan" in info.data:
-            timespan = info.data["timespan"]
-            max_duration = (timespan.to_date - timespan.from_date).days
-            if v > max_duration:
-                raise ValueError(
-                    f"Duration ({v} days) cannot exceed timespan ({max_duration} days)"
-                )
-        return v
+    @model_validator(mode="after")
+    def validate_duration_within_timespan(self):
+        max_duration = (self.timespan.to_date - self.timespan.from_date).days
+        if self.duration > max_duration:
+            raise ValueError(
+                f"Duration ({self.duration} days) cannot exceed timespan ({max_duration} days)"
+            )
+        return self
     
     def generate_date_ranges(self) -> list[tuple[date, date]]:
         """
@@ -65,20 +52,21 @@ class SimplifiedRoomSearchRequest(BaseModel):
         
         Returns list of (arrival, departure) tuples.
         """
-        date_ranges = []
-        current_arrival = self.timespan.from_date
-        max_arrival = self.timespan.to_date - timedelta(days=self.duration)
-        
-        while current_arrival <= max_arrival:
-            departure = current_arrival + timedelta(days=self.duration)
-            date_ranges.append((current_arrival, departure))
-            current_arrival += timedelta(days=1)
+        # Work on day ordinals to avoid building timedelta objects per range
+        start = self.timespan.from_date.toordinal()
+        duration = self.duration
+        count = self.timespan.to_date.toordinal() - start - duration + 1
         
-        return date_ranges
+        return [
+            (date.fromordinal(arrival), date.fromordinal(arrival + duration))
+            for arrival in range(start, start + count)
+        ]
 
 
 class RoomOptionWithDateRange(BaseModel):
     """Room option with associated date range"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     arrival: date
     departure: date
     catc: str = Field(..., description="Room category code")
@@ -95,6 +83,8 @@ class RoomOptionWithDateRange(BaseModel):
 
 class SimplifiedRoomSearchResponse(BaseModel):
     """Response model with all room options across date ranges"""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     total_queries: int = Field(..., description="Number of date ranges searched")
     total_options: int = Field(..., description="Total number of room options found")
     duration_days: int = Field(..., description="Stay duration in days")
@@ -1,127 +1,235 @@
 """Analytics service for tracking searches and bookings"""
 
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import UTC, datetime
 from typing import Any
 import asyncio
+import bisect
+import itertools
+import time
+import logfire
 from pydantic import BaseModel
-from collections import deque
+from collections import Counter, deque
 
 
-class AnalyticsEvent(BaseModel):
-    """Analytics event model"""
-    timestamp: datetime
-    event_type: str  # "room_search" or "reservation"
+@dataclass(slots=True)
+class AnalyticsEvent:
+    """Stored analytics event; the event type is given by the deque it lives in"""
+    timestamp: int  # Unix epoch milliseconds
     data: dict[str, Any]
     results_count: int | None = None  # Number of room options found (for searches)
 
 
+def _dump_json(model: BaseModel) -> dict[str, Any]:
+    """Dump a model to JSON-compatible data in a single serializer pass"""
+    return model.__pydantic_serializer__.to_python(model, mode="json")
+
+
+def _now_ms() -> int:
+    """Current wall-clock time as integer epoch milliseconds"""
+    return time.time_ns() // 1_000_000
+
+
+def _isoformat(timestamp: int) -> str:
+    """Format an epoch-ms timestamp as a naive UTC ISO string"""
+    return datetime.fromtimestamp(timestamp / 1000, UTC).replace(tzinfo=None).isoformat()
+
+
+class _EventLog:
+    """Time-ordered events with a running total of one numeric value per event"""
+    
+    def __init__(self, max_events: int):
+        self.events: deque[AnalyticsEvent] = deque(maxlen=max_events)
+        # Parallel to events: epoch-ms timestamps (for bisect) and the running
+        # total before each event (so any suffix sum is one subtraction)
+        self._times: deque[int] = deque(maxlen=max_events)
+        self._totals_before: deque[float] = deque(maxlen=max_events)
+        self._total: float = 0
+    
+    def append(self, event: AnalyticsEvent, value: float) -> None:
+        """Append an event that adds value to the running total"""
+        self.events.append(event)
+        self._times.append(event.timestamp)
+        self._totals_before.append(self._total)
+        self._total += value
+    
+    def prune_before(self, cutoff_time: int) -> None:
+        """Drop the events older than the cutoff from the front of the log"""
+        while self._times and self._times[0] < cutoff_time:
+            self.events.popleft()
+            self._times.popleft()
+            self._totals_before.popleft()
+    
+    def since(self, cutoff_time: int) -> tuple[list[AnalyticsEvent], float]:
+        """Get the events at or after the cutoff and the sum of their values"""
+        start = bisect.bisect_left(self._times, cutoff_time)
+        if start == len(self.events):
+            return [], 0
+        return list(itertools.islice(self.events, start, None)), self._total - self._totals_before[start]
+
+
+def _search_to_dict(event: AnalyticsEvent) -> dict[str, Any]:
+    """Convert a stored room search into its API representation"""
+    return {
+        "timestamp": _isoformat(event.timestamp),
+        "event_type": "room_search",
+        "data": event.data,
+        "results_count": event.results_count
+    }
+
+
+def _reservation_to_dict(event: AnalyticsEvent) -> dict[str, Any]:
+    """Convert a stored reservation into its API representation"""
+    return {
+        "timestamp": _isoformat(event.timestamp),
+        "event_type": "reservation",
+        "data": event.data
+    }
+
+
 class AnalyticsService:
     """Service for logging and retrieving analytics data (in-memory)"""
     
-    def __init__(self, max_events: int = 10000):
+    def __init__(
+        self,
+        max_events: int = 10000,
+        max_queued_events: int = 10000,
+        retention_hours: int = 24,
+    ):
         """
         Initialize analytics service with in-memory storage.
         
         Args:
             max_events: Maximum number of events to keep in memory per type
+            max_queued_events: Maximum number of events waiting for the background worker
+            retention_hours: Age after which events are dropped when data is read
         """
-        self._room_searches: deque[AnalyticsEvent] = deque(maxlen=max_events)
-        self._reservations: deque[AnalyticsEvent] = deque(maxlen=max_events)
-        self._lock = asyncio.Lock()
+        self._retention_ms = retention_hours * 3_600_000
+        
+        # Searches total their results count, reservations their amount.
+        # No lock is needed: the logs are only touched from the event loop
+        # and no update or read awaits partway through
+        self._room_searches = _EventLog(max_events)
+        self._reservations = _EventLog(max_events)
+        self._max_queued_events = max_queued_events
+        self._queue: asyncio.Queue[tuple[str, BaseModel, int, int]] = asyncio.Queue(maxsize=max_queued_events)
+        self._worker: asyncio.Task | None = None
     
-    async def log_room_search(self, search_data: dict[str, Any], results_count: int = 0) -> None:
+    def start(self) -> None:
+        """Start the background worker that stores queued events"""
+        if self._worker is None:
+            # A queue binds to the event loop that first waits on it, so every
+            # worker gets a fresh one; events queued before start carry over
+            queue: asyncio.Queue[tuple[str, BaseModel, int, int]] = asyncio.Queue(maxsize=self._max_queued_events)
+            while not self._queue.empty():
+                queue.put_nowait(self._queue.get_nowait())
+            self._queue = queue
+            self._worker = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the background worker"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+    
+    async def _run(self) -> None:
+        """Store queued events in batches until cancelled"""
+        while True:
+            batch = [await self._queue.get()]
+            # Drain everything already queued so a burst is handled in one wakeup
+            for _ in range(self._queue.qsize()):
+                batch.append(self._queue.get_nowait())
+            
+            try:
+                for event_type, request, timestamp, results_count in batch:
+                    if event_type == "room_search":
+                        self._store_room_search(AnalyticsEvent(timestamp, _dump_json(request), results_count))
+                    else:
+                        self._store_reservation(AnalyticsEvent(timestamp, _dump_json(request)))
+            except Exception:
+                # Losing one batch is better than stopping analytics for good
+                logfire.exception("Failed to store {count} analytics events", count=len(batch))
+    
+    def _store_room_search(self, event: AnalyticsEvent) -> None:
+        self._room_searches.append(event, event.results_count or 0)
+    
+    def _store_reservation(self, event: AnalyticsEvent) -> None:
+        self._reservations.append(event, event.data.get("total_amount", 0) or 0)
+    
+    def _enqueue(self, event_type: str, request: BaseModel, results_count: int = 0) -> None:
+        """Queue an event, dropping the oldest queued event when the queue is full"""
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait((event_type, request, _now_ms(), results_count))
+    
+    def enqueue_room_search(self, search_request: BaseModel, results_count: int = 0) -> None:
         """
-        Log a room search event
+        Queue a room search event without waiting for it to be stored
         
         Args:
-            search_data: The search request data
+            search_request: The search request model
             results_count: Number of room options found in the search results
         """
-        event = AnalyticsEvent(
-            timestamp=datetime.utcnow(),
-            event_type="room_search",
-            data=search_data,
-            results_count=results_count
-        )
-        async with self._lock:
-            self._room_searches.append(event)
-    
-    async def log_reservation(self, reservation_data: dict[str, Any]) -> None:
-        """Log a reservation event"""
-        event = AnalyticsEvent(
-            timestamp=datetime.utcnow(),
-            event_type="reservation",
-            data=reservation_data
-        )
-        async with self._lock:
-            self._reservations.append(event)
+        self._enqueue("room_search", search_request, results_count)
+    
+    def enqueue_reservation(self, reservation_request: BaseModel) -> None:
+        """Queue a reservation event without waiting for it to be stored"""
+        self._enqueue("reservation", reservation_request)
+    
+    def _prune(self) -> None:
+        """Drop events older than the retention window"""
+        cutoff_time = _now_ms() - self._retention_ms
+        self._room_searches.prune_before(cutoff_time)
+        self._reservations.prune_before(cutoff_time)
     
     async def get_room_searches(self, hours: int = 24) -> list[dict[str, Any]]:
         """Get room searches from the last N hours"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+        self._prune()
+        cutoff_time = _now_ms() - hours * 3_600_000
         
-        async with self._lock:
-            filtered_events = [
-                {
-                    "timestamp": event.timestamp.isoformat(),
-                    "event_type": event.event_type,
-                    "data": event.data,
-                    "results_count": event.results_count
-                }
-                for event in self._room_searches
-                if event.timestamp >= cutoff_time
-            ]
+        events, _ = self._room_searches.since(cutoff_time)
         
-        return filtered_events
+        return [_search_to_dict(event) for event in events]
     
     async def get_reservations(self, hours: int = 24) -> list[dict[str, Any]]:
         """Get reservations from the last N hours"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+        self._prune()
+        cutoff_time = _now_ms() - hours * 3_600_000
         
-        async with self._lock:
-            filtered_events = [
-                {
-                    "timestamp": event.timestamp.isoformat(),
-                    "event_type": event.event_type,
-                    "data": event.data
-                }
-                for event in self._reservations
-                if event.timestamp >= cutoff_time
-            ]
+        events, _ = self._reservations.since(cutoff_time)
         
-        return filtered_events
+        return [_reservation_to_dict(event) for event in events]
     
     async def get_analytics_summary(self, hours: int = 24) -> dict[str, Any]:
         """Get analytics summary for the specified timespan"""
-        searches = await self.get_room_searches(hours)
-        reservations = await self.get_reservations(hours)
+        self._prune()
+        cutoff_time = _now_ms() - hours * 3_600_000
+        
+        # Revenue and rooms found come from running totals, not a scan
+        search_events, total_rooms_found = self._room_searches.since(cutoff_time)
+        reservation_events, total_revenue = self._reservations.since(cutoff_time)
+        
+        # Build the search list and the popular durations in one pass
+        searches = []
+        room_durations: Counter[int] = Counter()
+        for event in search_events:
+            searches.append(_search_to_dict(event))
+            duration = event.data.get("duration", 0)
+            if duration > 0:
+                room_durations[duration] += 1
+        reservations = [_reservation_to_dict(event) for event in reservation_events]
         
         # Calculate summary statistics
         total_searches = len(searches)
         total_reservations = len(reservations)
         conversion_rate = (total_reservations / total_searches * 100) if total_searches > 0 else 0
         
-        # Calculate total revenue
-        total_revenue = sum(
-            res.get("data", {}).get("total_amount", 0)
-            for res in reservations
-        )
-        
-        # Get popular durations from searches
-        room_durations = {}
-        for search in searches:
-            duration = search.get("data", {}).get("duration", 0)
-            if duration > 0:
-                room_durations[duration] = room_durations.get(duration, 0) + 1
-        
-        # Get average booking value
+        # Get average booking value and results per search
         avg_booking_value = total_revenue / total_reservations if total_reservations > 0 else 0
-        
-        # Calculate total rooms found across all searches
-        total_rooms_found = sum(
-            search.get("results_count", 0) or 0
-            for search in searches
-        )
         avg_results_per_search = total_rooms_found / total_searches if total_searches > 0 else 0
         
         return {
@@ -133,22 +241,22 @@ class AnalyticsService:
             "average_booking_value": round(avg_booking_value, 2),
             "total_rooms_found": total_rooms_found,
             "average_results_per_search": round(avg_results_per_search, 2),
-            "popular_durations": dict(sorted(room_durations.items(), key=lambda x: x[1], reverse=True)[:5]),
+            "popular_durations": dict(room_durations.most_common(5)),
             "searches": searches,
             "reservations": reservations
         }
     
     async def get_stats(self) -> dict[str, Any]:
         """Get overall statistics about stored events"""
-        async with self._lock:
-            return {
-                "total_searches_in_memory": len(self._room_searches),
-                "total_reservations_in_memory": len(self._reservations),
-                "oldest_search": self._room_searches[0].timestamp.isoformat() if self._room_searches else None,
-                "newest_search": self._room_searches[-1].timestamp.isoformat() if self._room_searches else None,
-                "oldest_reservation": self._reservations[0].timestamp.isoformat() if self._reservations else None,
-                "newest_reservation": self._reservations[-1].timestamp.isoformat() if self._reservations else None,
-            }
+        self._prune()
+        return {
+            "total_searches_in_memory": len(self._room_searches.events),
+            "total_reservations_in_memory": len(self._reservations.events),
+            "oldest_search": _isoformat(self._room_searches.events[0].timestamp) if self._room_searches.events else None,
+            "newest_search": _isoformat(self._room_searches.events[-1].timestamp) if self._room_searches.events else None,
+            "oldest_reservation": _isoformat(self._reservations.events[0].timestamp) if self._reservations.events else None,
+            "newest_reservation": _isoformat(self._reservations.events[-1].timestamp) if self._reservations.events else None,
+        }
 
 
 # Singleton instance
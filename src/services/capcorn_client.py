@@ -1,9 +1,13 @@
 """CapCorn API client for making requests to the external API"""
 
+import asyncio
 import httpx
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
+from xml.sax.saxutils import escape
 
+from src.core.cache import TTLCache
 from src.core.config import get_settings
 from src.schemas.room_availability import (
     RoomAvailabilityRequest,
@@ -15,89 +19,224 @@ from src.schemas.room_availability import (
 )
 from src.schemas.reservation import ReservationRequest, ReservationResponse
 
+# Namespace of CapCorn availability responses, in ElementTree's {uri} notation
+CAPCORN_NAMESPACE = "{http://capcorn.at/}"
+
+# Reservation requests have a fixed OTA shape, so they are rendered from
+# templates. Text values are escaped with escape(), attribute values with _attr().
+# The templates carry the whole OTA contract: keep element order, attributes and
+# spacing in sync with what CapCorn expects when editing them
+_RESERVATION_XML = (
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    '<OTA_HotelResNotifRQ xmlns="http://www.opentravel.org/OTA/2003/05" '
+    'xmlns:xsd="http://www.w3.org/2001/XMLSchema" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" Version="1">'
+    '<POS><Source AgentDutyCode="{source}" /></POS>'
+    '<HotelReservations><HotelReservation CreateDateTime="{create_date_time}" ResStatus="Book">'
+    '<RoomStays><RoomStay>'
+    '<RoomTypes><RoomType NumberOfUnits="{number_of_units}" RoomTypeCode="{room_type_code}" /></RoomTypes>'
+    '<RatePlans><RatePlan><MealsIncluded MealPlanCodes="{meal_plan}" /></RatePlan></RatePlans>'
+    '<GuestCounts IsPerRoom="true">{guest_counts}</GuestCounts>'
+    '<TimeSpan Start="{arrival}" End="{departure}" />'
+    '<Total AmountAfterTax="{total_amount:.2f}" CurrencyCode="EUR" />'
+    '<BasicPropertyInfo HotelCode="{hotel_code}" />'
+    '</RoomStay></RoomStays>'
+    '{services}'
+    '<ResGuests><ResGuest>'
+    '<Profiles><ProfileInfo><Profile><Customer Language="de">'
+    '<PersonName><NamePrefix>{name_prefix}</NamePrefix><GivenName>{given_name}</GivenName>'
+    '<Surname>{surname}</Surname></PersonName>'
+    '<Telephone PhoneNumber="{phone_number}" />'
+    '<Email>{email}</Email>'
+    '<Address><AddressLine>{address_line}</AddressLine><CityName>{city_name}</CityName>'
+    '<PostalCode>{postal_code}</PostalCode><CountryName Code="{country_code}" /></Address>'
+    '</Customer></Profile></ProfileInfo></Profiles>'
+    '{comments}'
+    '</ResGuest></ResGuests>'
+    '<ResGlobalInfo><HotelReservationIDs>'
+    '<HotelReservationID ResID_Value="{reservation_id}" ResID_Source="{source}" />'
+    '</HotelReservationIDs></ResGlobalInfo>'
+    '</HotelReservation></HotelReservations></OTA_HotelResNotifRQ>'
+)
+_GUEST_COUNT_XML = '<GuestCount AgeQualifyingCode="{age_qualifying_code}" Count="{count}"{age} />'
+_SERVICE_XML = (
+    '<Service Quantity="{quantity}">'
+    '<ServiceDetails><ServiceDescription Name="{name}" /></ServiceDetails>'
+    '<Price><Base AmountAfterTax="{amount_after_tax:.2f}" /></Price>'
+    '</Service>'
+)
+_COMMENTS_XML = '<Comments><Comment><ListItem>{comment}</ListItem></Comment></Comments>'
+
+# Same entities ElementTree uses for attribute values
+_ATTR_ENTITIES = {'"': "&quot;", "\r": "&#13;", "\n": "&#10;", "\t": "&#09;"}
+
+
+def _attr(value: str) -> str:
+    """Escape a value for use inside a double-quoted XML attribute"""
+    return escape(value, _ATTR_ENTITIES)
+
+
+def _rooms_key(request: RoomAvailabilityRequest) -> tuple[tuple[int, tuple[int, ...]], ...]:
+    """Hashable form of the requested rooms: (adults, child ages) per room"""
+    return tuple((room.adults, tuple(child.age for child in room.children)) for room in request.rooms)
+
+
+@lru_cache(maxsize=256)
+def _room_availability_xml(
+    hotel_id: str,
+    language: int,
+    arrival: str,
+    departure: str,
+    rooms: tuple[tuple[int, tuple[int, ...]], ...],
+) -> str:
+    """Build the room availability XML; repeated searches reuse the built body"""
+    root = ET.Element("room_availability")
+    
+    # Language
+    ET.SubElement(root, "language").text = str(language)
+    
+    # Members
+    members = ET.SubElement(root, "members")
+    member = ET.SubElement(members, "member")
+    member.set("hotel_id", hotel_id)
+    
+    # Dates
+    ET.SubElement(root, "arrival").text = arrival
+    ET.SubElement(root, "departure").text = departure
+    
+    # Rooms
+    rooms_elem = ET.SubElement(root, "rooms")
+    for adults, child_ages in rooms:
+        room_elem = ET.SubElement(rooms_elem, "room")
+        room_elem.set("adults", str(adults))
+        
+        for age in child_ages:
+            child_elem = ET.SubElement(room_elem, "child")
+            child_elem.set("age", str(age))
+    
+    return ET.tostring(root, encoding="unicode")
+
 
 class CapCornClient:
     """Client for interacting with CapCorn API"""
     
-    def __init__(self):
+    def __init__(self, http_client: httpx.AsyncClient | None = None):
+        """
+        Initialize the CapCorn client.
+        
+        Args:
+            http_client: HTTP client to send requests with. By default the client
+                creates and owns a pooled one whose connections are kept alive
+                across requests; an injected client is left for the caller to close.
+        """
         self.settings = get_settings()
         self.base_url = self.settings.capcorn_base_url
-        self.timeout = 30.0
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or httpx.AsyncClient(
+            timeout=self.settings.capcorn_timeout,
+            limits=httpx.Limits(
+                max_connections=self.settings.capcorn_max_connections,
+                max_keepalive_connections=self.settings.capcorn_max_keepalive_connections,
+            ),
+        )
+        
+        # Short-lived cache of availability responses; identical searches within
+        # the TTL are served from memory instead of hitting CapCorn again
+        self._availability_cache = TTLCache(
+            maxsize=self.settings.capcorn_cache_maxsize,
+            ttl=self.settings.capcorn_cache_ttl,
+        )
+        self._availability_locks: dict[tuple, asyncio.Lock] = {}
+    
+    async def close(self) -> None:
+        """Close the HTTP connection pool if this client created it"""
+        if self._owns_http_client:
+            await self._http_client.aclose()
     
     def _build_room_availability_xml(self, request: RoomAvailabilityRequest) -> str:
         """Build XML for room availability request"""
-        root = ET.Element("room_availability")
-        
-        # Language
-        ET.SubElement(root, "language").text = str(request.language)
-        
-        # Members
-        members = ET.SubElement(root, "members")
-        member = ET.SubElement(members, "member")
-        member.set("hotel_id", request.hotel_id)
-        
-        # Dates
-        ET.SubElement(root, "arrival").text = request.arrival.isoformat()
-        ET.SubElement(root, "departure").text = request.departure.isoformat()
-        
-        # Rooms
-        rooms = ET.SubElement(root, "rooms")
-        for room in request.rooms:
-            room_elem = ET.SubElement(rooms, "room")
-            room_elem.set("adults", str(room.adults))
-            
-            for child in room.children:
-                child_elem = ET.SubElement(room_elem, "child")
-                child_elem.set("age", str(child.age))
-        
-        return ET.tostring(root, encoding="unicode")
+        return _room_availability_xml(
+            request.hotel_id,
+            request.language,
+            request.arrival.isoformat(),
+            request.departure.isoformat(),
+            _rooms_key(request),
+        )
     
     def _parse_room_availability_response(self, xml_str: str) -> RoomAvailabilityResponse:
-        """Parse XML response into Pydantic model"""
+        """
+        Parse XML response into Pydantic model.
+        
+        Values are converted to their field types while parsing, so the models
+        are built with model_construct and skip a second validation pass.
+        """
         root = ET.fromstring(xml_str)
         
-        # Handle XML namespace
-        ns = {"ns": "http://capcorn.at/"}
+        # Handle XML namespace: detect it once from the member elements (the
+        # namespace may be declared below the root), then look every element
+        # up by its fully qualified name. Descendants are walked with iter()
+        # so no path expression is parsed per element
+        has_namespace = next(root.iter(f"{CAPCORN_NAMESPACE}member"), None) is not None
+        prefix = CAPCORN_NAMESPACE if has_namespace else ""
+        member_tag = f"{prefix}member"
+        room_tag = f"{prefix}room"
+        arrival_tag = f"{prefix}arrival"
+        departure_tag = f"{prefix}departure"
+        adults_tag = f"{prefix}adults"
+        children_tag = f"{prefix}children"
+        child_tag = f"{prefix}child"
+        options_tag = f"{prefix}options"
+        option_tag = f"{prefix}option"
+        catc_tag = f"{prefix}catc"
+        type_tag = f"{prefix}type"
+        description_tag = f"{prefix}description"
+        size_tag = f"{prefix}size"
+        price_tag = f"{prefix}price"
+        price_per_person_tag = f"{prefix}price_per_person"
+        price_per_adult_tag = f"{prefix}price_per_adult"
+        price_per_night_tag = f"{prefix}price_per_night"
+        board_tag = f"{prefix}board"
+        room_type_tag = f"{prefix}room_type"
         
         members_data = []
-        for member_elem in root.findall(".//ns:member", ns) or root.findall(".//member"):
+        for member_elem in root.iter(member_tag):
             hotel_id = member_elem.get("hotel_id", "")
             
             rooms_data = []
-            for room_elem in member_elem.findall(".//ns:room", ns) or member_elem.findall(".//room"):
+            for room_elem in member_elem.iter(room_tag):
                 # Parse room details
-                arrival = room_elem.findtext("ns:arrival", default="", namespaces=ns) or room_elem.findtext("arrival", "")
-                departure = room_elem.findtext("ns:departure", default="", namespaces=ns) or room_elem.findtext("departure", "")
-                adults = int(room_elem.findtext("ns:adults", default="0", namespaces=ns) or room_elem.findtext("adults", "0"))
+                arrival = date.fromisoformat(room_elem.findtext(arrival_tag) or "")
+                departure = date.fromisoformat(room_elem.findtext(departure_tag) or "")
+                adults = int(room_elem.findtext(adults_tag) or 0)
                 
                 # Parse children
                 children_data = []
-                children_elem = room_elem.find("ns:children", ns) or room_elem.find("children")
+                children_elem = room_elem.find(children_tag)
                 if children_elem is not None:
-                    for child_elem in children_elem.findall("ns:child", ns) or children_elem.findall("child"):
+                    for child_elem in children_elem.findall(child_tag):
                         age = int(child_elem.get("age", 0))
-                        children_data.append(ChildResponse(age=age))
+                        children_data.append(ChildResponse.model_construct(age=age))
                 
                 # Parse options
                 options_data = []
-                options_elem = room_elem.find("ns:options", ns) or room_elem.find("options")
+                options_elem = room_elem.find(options_tag)
                 if options_elem is not None:
-                    for option_elem in options_elem.findall("ns:option", ns) or options_elem.findall("option"):
-                        option = RoomOption(
-                            catc=option_elem.findtext("ns:catc", default="", namespaces=ns) or option_elem.findtext("catc", ""),
-                            type=option_elem.findtext("ns:type", default="", namespaces=ns) or option_elem.findtext("type", ""),
-                            description=option_elem.findtext("ns:description", default="", namespaces=ns) or option_elem.findtext("description", ""),
-                            size=int(option_elem.findtext("ns:size", default="0", namespaces=ns) or option_elem.findtext("size", "0")),
-                            price=float(option_elem.findtext("ns:price", default="0", namespaces=ns) or option_elem.findtext("price", "0")),
-                            price_per_person=float(option_elem.findtext("ns:price_per_person", default="0", namespaces=ns) or option_elem.findtext("price_per_person", "0")),
-                            price_per_adult=float(option_elem.findtext("ns:price_per_adult", default="0", namespaces=ns) or option_elem.findtext("price_per_adult", "0")),
-                            price_per_night=float(option_elem.findtext("ns:price_per_night", default="0", namespaces=ns) or option_elem.findtext("price_per_night", "0")),
-                            board=int(option_elem.findtext("ns:board", default="1", namespaces=ns) or option_elem.findtext("board", "1")),
-                            room_type=int(option_elem.findtext("ns:room_type", default="1", namespaces=ns) or option_elem.findtext("room_type", "1")),
+                    for option_elem in options_elem.findall(option_tag):
+                        option = RoomOption.model_construct(
+                            catc=option_elem.findtext(catc_tag) or "",
+                            type=option_elem.findtext(type_tag) or "",
+                            description=option_elem.findtext(description_tag) or "",
+                            size=int(option_elem.findtext(size_tag) or 0),
+                            price=float(option_elem.findtext(price_tag) or 0),
+                            price_per_person=float(option_elem.findtext(price_per_person_tag) or 0),
+                            price_per_adult=float(option_elem.findtext(price_per_adult_tag) or 0),
+                            price_per_night=float(option_elem.findtext(price_per_night_tag) or 0),
+                            board=int(option_elem.findtext(board_tag) or 1),
+                            room_type=int(option_elem.findtext(room_type_tag) or 1),
                         )
                         options_data.append(option)
                 
-                rooms_data.append(RoomResponse(
+                rooms_data.append(RoomResponse.model_construct(
                     arrival=arrival,
                     departure=departure,
                     adults=adults,
@@ -105,17 +244,51 @@ class CapCornClient:
                     options=options_data,
                 ))
             
-            members_data.append(MemberResponse(
+            members_data.append(MemberResponse.model_construct(
                 hotel_id=hotel_id,
                 rooms=rooms_data,
             ))
         
-        return RoomAvailabilityResponse(members=members_data)
+        return RoomAvailabilityResponse.model_construct(members=members_data)
     
     async def search_room_availability(
         self, request: RoomAvailabilityRequest
     ) -> RoomAvailabilityResponse:
-        """Search for available rooms"""
+        """Search for available rooms, serving repeated searches from the cache"""
+        key = (
+            request.hotel_id,
+            request.language,
+            request.arrival,
+            request.departure,
+            _rooms_key(request),
+        )
+        cached = self._availability_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Concurrent misses for the same search wait for a single upstream call.
+        # Only the caller that created the lock removes it, so waiters and
+        # later arrivals keep sharing it until that caller is done
+        lock = self._availability_locks.get(key)
+        owns_lock = lock is None
+        if owns_lock:
+            lock = asyncio.Lock()
+            self._availability_locks[key] = lock
+        try:
+            async with lock:
+                cached = self._availability_cache.get(key)
+                if cached is None:
+                    cached = await self._fetch_room_availability(request)
+                    self._availability_cache.set(key, cached)
+                return cached
+        finally:
+            if owns_lock and self._availability_locks.get(key) is lock:
+                del self._availability_locks[key]
+    
+    async def _fetch_room_availability(
+        self, request: RoomAvailabilityRequest
+    ) -> RoomAvailabilityResponse:
+        """Request room availability from CapCorn"""
         url = f"{self.base_url}/RoomAvailability"
         params = {
             "user": self.settings.capcorn_user,
@@ -126,128 +299,64 @@ class CapCornClient:
         xml_body = self._build_room_availability_xml(request)
         headers = {"Content-Type": "application/xml"}
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(url, params=params, content=xml_body, headers=headers)
-            response.raise_for_status()
-            
-            return self._parse_room_availability_response(response.text)
+        response = await self._http_client.post(url, params=params, content=xml_body, headers=headers)
+        response.raise_for_status()
+        
+        return self._parse_room_availability_response(response.text)
     
     def _build_reservation_xml(self, request: ReservationRequest) -> str:
         """Build XML for reservation request (OTA format)"""
-        root = ET.Element("OTA_HotelResNotifRQ")
-        root.set("xmlns", "http://www.opentravel.org/OTA/2003/05")
-        root.set("xmlns:xsd", "http://www.w3.org/2001/XMLSchema")
-        root.set("xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance")
-        root.set("Version", "1")
-        
-        # POS
-        pos = ET.SubElement(root, "POS")
-        source = ET.SubElement(pos, "Source")
-        source.set("AgentDutyCode", request.source)
-        
-        # HotelReservations
-        hotel_reservations = ET.SubElement(root, "HotelReservations")
-        hotel_reservation = ET.SubElement(hotel_reservations, "HotelReservation")
-        hotel_reservation.set("CreateDateTime", datetime.now().isoformat())
-        hotel_reservation.set("ResStatus", "Book")
-        
-        # RoomStays
-        room_stays = ET.SubElement(hotel_reservation, "RoomStays")
-        room_stay = ET.SubElement(room_stays, "RoomStay")
-        
-        # RoomTypes
-        room_types = ET.SubElement(room_stay, "RoomTypes")
-        room_type = ET.SubElement(room_types, "RoomType")
-        room_type.set("NumberOfUnits", str(request.number_of_units))
-        room_type.set("RoomTypeCode", request.room_type_code)
-        
-        # RatePlans
-        rate_plans = ET.SubElement(room_stay, "RatePlans")
-        rate_plan = ET.SubElement(rate_plans, "RatePlan")
-        meals_included = ET.SubElement(rate_plan, "MealsIncluded")
-        meals_included.set("MealPlanCodes", str(request.meal_plan.value))
-        
-        # GuestCounts
-        guest_counts = ET.SubElement(room_stay, "GuestCounts")
-        guest_counts.set("IsPerRoom", "true")
-        for guest_count in request.guest_counts:
-            guest_count_elem = ET.SubElement(guest_counts, "GuestCount")
-            guest_count_elem.set("AgeQualifyingCode", str(guest_count.age_qualifying_code))
-            guest_count_elem.set("Count", str(guest_count.count))
-            if guest_count.age is not None:
-                guest_count_elem.set("Age", str(guest_count.age))
-        
-        # TimeSpan
-        time_span = ET.SubElement(room_stay, "TimeSpan")
-        time_span.set("Start", request.arrival.isoformat())
-        time_span.set("End", request.departure.isoformat())
-        
-        # Total
-        total = ET.SubElement(room_stay, "Total")
-        total.set("AmountAfterTax", f"{request.total_amount:.2f}")
-        total.set("CurrencyCode", "EUR")
-        
-        # BasicPropertyInfo
-        basic_property = ET.SubElement(room_stay, "BasicPropertyInfo")
-        basic_property.set("HotelCode", self.settings.capcorn_hotel_id)
+        guest = request.guest
+        address = guest.address
+        
+        guest_counts = "".join(
+            _GUEST_COUNT_XML.format(
+                age_qualifying_code=guest_count.age_qualifying_code,
+                count=guest_count.count,
+                age=f' Age="{guest_count.age}"' if guest_count.age is not None else "",
+            )
+            for guest_count in request.guest_counts
+        )
         
-        # Services
+        services = ""
         if request.services:
-            services = ET.SubElement(hotel_reservation, "Services")
-            for service in request.services:
-                service_elem = ET.SubElement(services, "Service")
-                service_elem.set("Quantity", str(service.quantity))
-                
-                service_details = ET.SubElement(service_elem, "ServiceDetails")
-                service_desc = ET.SubElement(service_details, "ServiceDescription")
-                service_desc.set("Name", service.name)
-                
-                price = ET.SubElement(service_elem, "Price")
-                base = ET.SubElement(price, "Base")
-                base.set("AmountAfterTax", f"{service.amount_after_tax:.2f}")
-        
-        # ResGuests
-        res_guests = ET.SubElement(hotel_reservation, "ResGuests")
-        res_guest = ET.SubElement(res_guests, "ResGuest")
-        
-        profiles = ET.SubElement(res_guest, "Profiles")
-        profile_info = ET.SubElement(profiles, "ProfileInfo")
-        profile = ET.SubElement(profile_info, "Profile")
-        
-        customer = ET.SubElement(profile, "Customer")
-        customer.set("Language", "de")
-        
-        person_name = ET.SubElement(customer, "PersonName")
-        ET.SubElement(person_name, "NamePrefix").text = request.guest.name_prefix
-        ET.SubElement(person_name, "GivenName").text = request.guest.given_name
-        ET.SubElement(person_name, "Surname").text = request.guest.surname
-        
-        telephone = ET.SubElement(customer, "Telephone")
-        telephone.set("PhoneNumber", request.guest.phone_number)
-        
-        ET.SubElement(customer, "Email").text = request.guest.email
-        
-        address = ET.SubElement(customer, "Address")
-        ET.SubElement(address, "AddressLine").text = request.guest.address.address_line
-        ET.SubElement(address, "CityName").text = request.guest.address.city_name
-        ET.SubElement(address, "PostalCode").text = request.guest.address.postal_code
-        country_name = ET.SubElement(address, "CountryName")
-        country_name.set("Code", request.guest.address.country_code)
+            services = "<Services>" + "".join(
+                _SERVICE_XML.format(
+                    quantity=service.quantity,
+                    name=_attr(service.name),
+                    amount_after_tax=service.amount_after_tax,
+                )
+                for service in request.services
+            ) + "</Services>"
         
-        # Comments
+        comments = ""
         if request.booking_comment:
-            comments = ET.SubElement(res_guest, "Comments")
-            comment = ET.SubElement(comments, "Comment")
-            ET.SubElement(comment, "ListItem").text = request.booking_comment
-        
-        # ResGlobalInfo
-        res_global_info = ET.SubElement(hotel_reservation, "ResGlobalInfo")
-        hotel_reservation_ids = ET.SubElement(res_global_info, "HotelReservationIDs")
-        hotel_reservation_id = ET.SubElement(hotel_reservation_ids, "HotelReservationID")
-        hotel_reservation_id.set("ResID_Value", request.reservation_id)
-        hotel_reservation_id.set("ResID_Source", request.source)
-        
-        return '<?xml version="1.0" encoding="utf-8"?>\n' + ET.tostring(root, encoding="unicode")
+            comments = _COMMENTS_XML.format(comment=escape(request.booking_comment))
+        
+        return _RESERVATION_XML.format(
+            source=_attr(request.source),
+            create_date_time=datetime.now().isoformat(),
+            number_of_units=request.number_of_units,
+            room_type_code=_attr(request.room_type_code),
+            meal_plan=request.meal_plan,
+            guest_counts=guest_counts,
+            arrival=request.arrival.isoformat(),
+            departure=request.departure.isoformat(),
+            total_amount=request.total_amount,
+            hotel_code=_attr(self.settings.capcorn_hotel_id),
+            services=services,
+            name_prefix=escape(guest.name_prefix),
+            given_name=escape(guest.given_name),
+            surname=escape(guest.surname),
+            phone_number=_attr(guest.phone_number),
+            email=escape(guest.email),
+            address_line=escape(address.address_line),
+            city_name=escape(address.city_name),
+            postal_code=escape(address.postal_code),
+            country_code=_attr(address.country_code),
+            comments=comments,
+            reservation_id=_attr(request.reservation_id),
+        )
     
     async def create_reservation(self, request: ReservationRequest) -> ReservationResponse:
         """Create a new reservation"""
@@ -261,15 +370,14 @@ class CapCornClient:
         headers = {"Content-Type": "application/xml"}
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(url, params=params, content=xml_body, headers=headers)
-                response.raise_for_status()
-                
-                return ReservationResponse(
-                    success=True,
-                    message="Reservation created successfully",
-                    reservation_id=request.reservation_id,
-                )
+            response = await self._http_client.post(url, params=params, content=xml_body, headers=headers)
+            response.raise_for_status()
+            
+            return ReservationResponse(
+                success=True,
+                message="Reservation created successfully",
+                reservation_id=request.reservation_id,
+            )
         except httpx.HTTPStatusError as e:
             return ReservationResponse(
                 success=False,